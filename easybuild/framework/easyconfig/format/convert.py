@@ -28,13 +28,20 @@ This module implements easyconfig specific formats and their conversions.
 
 :author: Stijn De Weirdt (Ghent University)
 """
+import re
+
 from easybuild.framework.easyconfig.format.version import VersionOperator, ToolchainVersionOperator
 from easybuild.tools.convert import Convert
 
 
+SEPARATOR_DEP = ';'
+# precompiled splitter for dependency strings, strips whitespace around separator
+_DEP_SPLIT = re.compile(r'\s*%s\s*' % re.escape(SEPARATOR_DEP)).split
+
+
 class Dependency(Convert):
     """Handle dependency"""
-    SEPARATOR_DEP = ';'
+    SEPARATOR_DEP = SEPARATOR_DEP
     __wraps__ = dict
 
     def __init__(self, obj, name=None):
@@ -49,8 +56,8 @@ class Dependency(Convert):
         """
         res = {}
 
-        items = self._split_string(txt, sep=self.SEPARATOR_DEP)
-        if len(items) < 1 or len(items) > 2:
+        items = _DEP_SPLIT(txt.strip())
+        if len(items) > 2:
             msg = 'Dependency has at least one element (a version operator string), '
             msg += 'and at most 2 (2nd element the toolchain version operator string). '
             msg += 'Separator %s.' % self.SEPARATOR_DEP
@@ -58,7 +65,7 @@ class Dependency(Convert):
 
         res['versop'] = VersionOperator(items[0])
 
-        if len(items) > 1:
+        if len(items) == 2:
             res['tc_versop'] = ToolchainVersionOperator(items[1])
 
         return res
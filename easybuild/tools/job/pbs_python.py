@@ -30,6 +30,7 @@ Interface module to TORQUE (PBS).
 :author: Kenneth Hoste (Ghent University)
 """
 from distutils.version import LooseVersion
+from itertools import chain
 import os
 import re
 import tempfile
@@ -91,6 +92,9 @@ class PbsPython(JobBackend):
         self.pbs_server = pbs_server or build_option('job_target_resource') or pbs.pbs_default()
         self.conn = None
         self._ppn = None
+        self._pbsquery = None
+        # cache for attribute lists used to query job info, see _get_attrl
+        self._attrl_cache = {}
 
     def init(self):
         """
@@ -152,25 +156,31 @@ class PbsPython(JobBackend):
         pbs.pbs_disconnect(self.conn)
         self.conn = None
 
+    def _get_pbsquery(self):
+        """Return (cached) `PBSQuery` instance to query PBS server with."""
+        if self._pbsquery is None:
+            self._pbsquery = PBSQuery()
+        return self._pbsquery
+
+    pbsquery = property(_get_pbsquery)
+
     def _get_ppn(self):
         """Guess PBS' `ppn` value for a full node."""
         # cache this value as it's not likely going to change over the
         # `eb` script runtime ...
         if not self._ppn:
-            pq = PBSQuery()
-            node_vals = pq.getnodes().values()  # only the values, not the names
+            node_vals = self.pbsquery.getnodes().values()  # only the values, not the names
             interesting_nodes = ('free', 'job-exclusive',)
-            res = {}
-            for np in [int(x['np'][0]) for x in node_vals if x['state'][0] in interesting_nodes]:
-                res.setdefault(np, 0)
-                res[np] += 1
+            counts = {}
+            for np in (int(x['np'][0]) for x in node_vals if x['state'][0] in interesting_nodes):
+                counts[np] = counts.get(np, 0) + 1
 
-            if not res:
+            if not counts:
                 raise EasyBuildError("Could not guess the ppn value of a full node because " +
                                      "there are no free or job-exclusive nodes.")
 
-            # return most frequent
-            freq_count, freq_np = max([(j, i) for i, j in res.items()])
+            # return most frequent (largest np value wins in case of a tie)
+            freq_np, freq_count = max(counts.items(), key=lambda np_count: (np_count[1], np_count[0]))
             self.log.debug("Found most frequent np %s (%s times) in interesting nodes %s",
                            freq_np, freq_count, interesting_nodes)
 
@@ -180,6 +190,21 @@ class PbsPython(JobBackend):
 
     ppn = property(_get_ppn)
 
+    def _get_attrl(self, types):
+        """
+        Return (cached) attribute list to query PBS with for the specified attribute types.
+
+        Order of specified types is irrelevant, so the list can be reused across queries.
+        """
+        key = tuple(sorted(types))
+        attrl = self._attrl_cache.get(key)
+        if attrl is None:
+            attrl = pbs.new_attrl(len(key))
+            for idx, attr in enumerate(key):
+                attrl[idx].name = attr
+            self._attrl_cache[key] = attrl
+        return attrl
+
     def make_job(self, script, name, env_vars=None, hours=None, cores=None):
         """Create and return a `PbsJob` object with the given parameters."""
         return PbsJob(self, script, name, env_vars=env_vars, hours=hours, cores=cores, conn=self.conn, ppn=self.ppn)
@@ -279,8 +304,12 @@ class PbsJob(object):
         txt = self.script
         self.log.debug("Going to submit script %s" % txt)
 
-        # Build default pbs_attributes list
-        pbs_attributes = pbs.new_attropl(3)
+        # determine number of attributes up front, so they can all be allocated in one go:
+        # Job_Name, output/error paths, resources, dependencies (if any), hold, variables and mail settings
+        attr_cnt = 3 + len(self.resources) + (1 if self.deps else 0) + 3
+        pbs_attributes = pbs.new_attropl(attr_cnt)
+
+        # default attributes
         pbs_attributes[0].name = pbs.ATTR_N  # Job_Name
         pbs_attributes[0].value = self.name
 
@@ -290,60 +319,57 @@ class PbsJob(object):
 
         pbs_attributes[2].name = pbs.ATTR_e
         pbs_attributes[2].value = os.path.join(output_dir, '%s.e$PBS_JOBID' % self.name)
+        idx = 3
 
         # set resource requirements
-        resource_attributes = pbs.new_attropl(len(self.resources))
-        idx = 0
         for k, v in self.resources.items():
-            resource_attributes[idx].name = pbs.ATTR_l  # Resource_List
-            resource_attributes[idx].resource = k
-            resource_attributes[idx].value = v
+            pbs_attributes[idx].name = pbs.ATTR_l  # Resource_List
+            pbs_attributes[idx].resource = k
+            pbs_attributes[idx].value = v
             idx += 1
-        pbs_attributes.extend(resource_attributes)
 
         # add job dependencies to attributes
         if self.deps:
-            deps_attributes = pbs.new_attropl(1)
-            deps_attributes[0].name = pbs.ATTR_depend
-            deps_attributes[0].value = ','.join([self.job_deps_type + ':' + dep.jobid for dep in self.deps])
-            pbs_attributes.extend(deps_attributes)
-            self.log.debug("Job deps attributes: %s" % deps_attributes[0].value)
+            pbs_attributes[idx].name = pbs.ATTR_depend
+            dep_prefix = self.job_deps_type + ':'
+            pbs_attributes[idx].value = ','.join(dep_prefix + dep.jobid for dep in self.deps)
+            self.log.debug("Job deps attributes: %s" % pbs_attributes[idx].value)
+            idx += 1
 
         # submit job with (user) hold
-        hold_attributes = pbs.new_attropl(1)
-        hold_attributes[0].name = pbs.ATTR_h
-        hold_attributes[0].value = pbs.USER_HOLD
-        pbs_attributes.extend(hold_attributes)
+        pbs_attributes[idx].name = pbs.ATTR_h
+        pbs_attributes[idx].value = pbs.USER_HOLD
         self.holds.append(pbs.USER_HOLD)
-        self.log.debug("Job hold attributes: %s" % hold_attributes[0].value)
+        self.log.debug("Job hold attributes: %s" % pbs_attributes[idx].value)
+        idx += 1
 
         # add a bunch of variables (added by qsub)
         # also set PBS_O_WORKDIR to os.getcwd()
         os.environ.setdefault('WORKDIR', os.getcwd())
 
         defvars = ['MAIL', 'HOME', 'PATH', 'SHELL', 'WORKDIR']
-        pbsvars = ["PBS_O_%s=%s" % (x, os.environ.get(x, 'NOTFOUND_%s' % x)) for x in defvars]
+        pbsvars = ("PBS_O_%s=%s" % (x, os.environ.get(x, 'NOTFOUND_%s' % x)) for x in defvars)
         # extend PBS variables with specified variables
-        pbsvars.extend(["%s=%s" % (name, value) for (name, value) in self.env_vars.items()])
-        variable_attributes = pbs.new_attropl(1)
-        variable_attributes[0].name = pbs.ATTR_v  # Variable_List
-        variable_attributes[0].value = ",".join(pbsvars)
-
-        pbs_attributes.extend(variable_attributes)
-        self.log.debug("Job variable attributes: %s" % variable_attributes[0].value)
+        envvars = ("%s=%s" % name_value for name_value in self.env_vars.items())
+        pbs_attributes[idx].name = pbs.ATTR_v  # Variable_List
+        pbs_attributes[idx].value = ",".join(chain(pbsvars, envvars))
+        self.log.debug("Job variable attributes: %s" % pbs_attributes[idx].value)
+        idx += 1
 
         # mail settings
-        mail_attributes = pbs.new_attropl(1)
-        mail_attributes[0].name = pbs.ATTR_m  # Mail_Points
-        mail_attributes[0].value = 'n'  # disable all mail
-        pbs_attributes.extend(mail_attributes)
-        self.log.debug("Job mail attributes: %s" % mail_attributes[0].value)
+        pbs_attributes[idx].name = pbs.ATTR_m  # Mail_Points
+        pbs_attributes[idx].value = 'n'  # disable all mail
+        self.log.debug("Job mail attributes: %s" % pbs_attributes[idx].value)
 
         fh, scriptfn = tempfile.mkstemp()
-        f = os.fdopen(fh, 'w')
         self.log.debug("Writing temporary job script to %s" % scriptfn)
-        f.write(txt)
-        f.close()
+        # write job script straight to file descriptor, no need for a (buffered) file object
+        data = txt if isinstance(txt, bytes) else txt.encode('utf-8')
+        try:
+            while data:
+                data = data[os.write(fh, data):]
+        finally:
+            os.close(fh)
 
         self.log.debug("Going to submit to queue %s" % self.queue)
 
@@ -411,13 +437,13 @@ class PbsJob(object):
         Return the state of the job
         State can be 'not submitted', 'running', 'queued' or 'finished',
         """
+        if self.jobid is None:
+            return 'not submitted'
+
         state = self.info(types=['job_state', 'exec_host'])
 
         if state is None:
-            if self.jobid is None:
-                return 'not submitted'
-            else:
-                return 'finished'
+            return 'finished'
 
         jid = state['id']
 
@@ -428,15 +454,17 @@ class PbsJob(object):
             - txt: format: host1/cpuid+host2/cpuid
             - num: number of nodes to return (default: all)
             """
-            if num is None:
-                num = -1
+            seen = set()
             res = []
             for h_c in txt.split('+'):
-                h = h_c.split('/')[0]
-                if h in res:
+                h = h_c.partition('/')[0]
+                if h in seen:
                     continue
+                seen.add(h)
                 res.append(h)
-            return res[:num]
+                if len(res) == num:
+                    break
+            return res
 
         ehosts = get_uniq_hosts(state.get('exec_host', ''), 1)
 
@@ -464,9 +492,7 @@ class PbsJob(object):
         if types is None:
             jobattr = NULL
         else:
-            jobattr = pbs.new_attrl(len(types))
-            for idx, attr in enumerate(types):
-                jobattr[idx].name = attr
+            jobattr = self._server._get_attrl(types)
 
         jobs = pbs.pbs_statjob(self.pbsconn, self.jobid, jobattr, NULL)
         if len(jobs) == 0:
@@ -482,7 +508,7 @@ class PbsJob(object):
         # only expect to have a list with one element
         j = jobs[0]
         # convert attribs into useable dict
-        job_details = dict([(attrib.name, attrib.value) for attrib in j.attribs])
+        job_details = dict((attrib.name, attrib.value) for attrib in j.attribs)
         # manually set 'id' attribute
         job_details['id'] = j.name
         self.log.debug("Found jobinfo %s" % job_details)
@@ -59,6 +59,13 @@ class ConvertTest(EnhancedTestCase):
         self.assertEqual(dest, res)
         self.assertEqual(str(res), txt)
 
+        # whitespace around separator is ignored
+        res = Dependency(' %s  %s %s ' % (versop_str, Dependency.SEPARATOR_DEP, tc_versop_str))
+        self.assertEqual(dest, res)
+        self.assertEqual(str(res), txt)
+
+        self.assertErrorRegex(ValueError, "at most 2", Dependency, ';'.join([versop_str, tc_versop_str, 'foo']))
+
 
 def suite():
     """ returns all the testcases in this module """
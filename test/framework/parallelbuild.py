@@ -107,6 +107,44 @@ class MockPbsJob(object):
         pass
 
 
+class MockPbsAttr(object):
+    """Mocking class for pbs attribute (list entry)."""
+
+    def __init__(self):
+        self.name = None
+        self.value = None
+
+
+class MockPbsStatJob(object):
+    """Mocking class for result of pbs_statjob."""
+
+    def __init__(self, jobid, attribs):
+        self.name = jobid
+        self.attribs = attribs
+
+
+class MockPbs(object):
+    """Mocking class for pbs module."""
+
+    new_attrl_calls = 0
+
+    @staticmethod
+    def new_attrl(cnt):
+        MockPbs.new_attrl_calls += 1
+        return [MockPbsAttr() for _ in range(cnt)]
+
+    @staticmethod
+    def pbs_statjob(conn, jobid, attrl, extend):
+        job_info = {'job_state': 'R', 'exec_host': 'node1/0+node1/1+node2/0'}
+        attribs = []
+        for attr in attrl:
+            attrib = MockPbsAttr()
+            attrib.name = attr.name
+            attrib.value = job_info[attr.name]
+            attribs.append(attrib)
+        return [MockPbsStatJob(jobid, attribs)]
+
+
 class ParallelBuildTest(EnhancedTestCase):
     """ Testcase for run module """
 
@@ -213,6 +251,56 @@ class ParallelBuildTest(EnhancedTestCase):
         PbsPython.ppn = PbsPython_ppn
         pbs_python.PbsJob = pbs_python_PbsJob
 
+    def test_pbs_python_job_info(self):
+        """Test PbsJob.info and PbsJob.state, using mocked pbs module."""
+        # put mocked functions in place
+        PbsPython__init__ = PbsPython.__init__
+        PbsPython_check_version = PbsPython._check_version
+        PbsPython_connect_to_server = PbsPython.connect_to_server
+        orig_pbs = getattr(pbs_python, 'pbs', None)
+
+        PbsPython.__init__ = lambda self: PbsPython__init__(self, pbs_server='localhost')
+        PbsPython._check_version = lambda _: True
+        PbsPython.connect_to_server = mock
+        pbs_python.pbs = MockPbs
+        MockPbs.new_attrl_calls = 0
+
+        init_config(args=['--job-backend=PbsPython'], build_options={'job_max_walltime': 24})
+
+        server = PbsPython()
+        job = pbs_python.PbsJob(server, 'echo test', 'test', ppn=4)
+
+        # no job info (or query to PBS) for job that is not submitted yet
+        self.assertEqual(job.info(), None)
+        self.assertEqual(job.state(), 'not submitted')
+        self.assertEqual(MockPbs.new_attrl_calls, 0)
+
+        job.jobid = '123.localhost'
+        res = job.info(types=['job_state', 'exec_host'])
+        expected = {'id': '123.localhost', 'job_state': 'R', 'exec_host': 'node1/0+node1/1+node2/0'}
+        self.assertEqual(res, expected)
+        self.assertEqual(MockPbs.new_attrl_calls, 1)
+
+        # attribute list is reused, regardless of order of specified types
+        attrl = server._get_attrl(['job_state', 'exec_host'])
+        self.assertTrue(server._get_attrl(['exec_host', 'job_state']) is attrl)
+        self.assertEqual(job.info(types=['exec_host', 'job_state']), expected)
+        self.assertEqual(job.state(), 'running')
+        self.assertEqual(MockPbs.new_attrl_calls, 1)
+
+        # new attribute list is created for different set of types
+        self.assertEqual(job.info(types='job_state'), {'id': '123.localhost', 'job_state': 'R'})
+        self.assertEqual(MockPbs.new_attrl_calls, 2)
+
+        # restore mocked stuff
+        PbsPython.__init__ = PbsPython__init__
+        PbsPython._check_version = PbsPython_check_version
+        PbsPython.connect_to_server = PbsPython_connect_to_server
+        if orig_pbs is None:
+            del pbs_python.pbs
+        else:
+            pbs_python.pbs = orig_pbs
+
     def test_build_easyconfigs_in_parallel_gc3pie(self):
         """Test build_easyconfigs_in_parallel(), using GC3Pie with local config as backend for --job."""
         try: